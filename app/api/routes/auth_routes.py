@@ -1,45 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
-from app.schemas.user_dto import UserCreateDTO, UserResponse
+from datetime import datetime, timezone
+from typing import Optional
+import jwt
+from app.schemas.user_dto import USER_RESPONSE_ADAPTER, UserCreateDTO, UserResponse
 from app.schemas.auth_dto import TokenResponse, RefreshTokenRequest
 from app.services.user_service import UserService
 from app.repositories.refresh_token_repository import RefreshTokenRepository
-import secrets
-from app.db.base import get_db
-from sqlalchemy.orm import Session
-from app.core.config import settings
-from app.core.security import create_access_token, get_current_user
+from app.db.base import SessionLocal, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import (
+    auth_ctx,
+    create_access_token,
+    create_refresh_jwt,
+    decode_refresh_jwt,
+    revoke_refresh_jti,
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-def create_refresh_token(user_id: int, db: Session):
+async def record_refresh_token(
+    user_id: int,
+    jti: str,
+    expires_at: datetime,
+    replaces: Optional[dict] = None,
+):
+    """Write a refresh token (and the one it replaces) to the audit table.
+
+    `replaces` holds the claims of the rotated token.
+    """
+    async with SessionLocal() as db:
+        if replaces:
+            await RefreshTokenRepository.mark_revoked(
+                db,
+                user_id,
+                replaces["jti"],
+                datetime.fromtimestamp(replaces["exp"], timezone.utc),
+            )
+        await RefreshTokenRepository.create(db, user_id, jti, expires_at)
+
+def create_refresh_token(
+    user_id: int, background_tasks: BackgroundTasks, replaces: Optional[dict] = None
+) -> str:
     """Create a new refresh token for a user."""
-    token = secrets.token_hex(32)
-    expires_at = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token_repo = RefreshTokenRepository(db)
-    refresh_token_repo.create(user_id, token, expires_at)
+    token, claims = create_refresh_jwt(user_id)
+    background_tasks.add_task(
+        record_refresh_token, user_id, claims["jti"], claims["exp"], replaces
+    )
     return token
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreateDTO, db: Session = Depends(get_db)):
+async def register(user_data: UserCreateDTO, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
-    user_service = UserService(db)
     try:
-        user = user_service.create_user(user_data)
-        return UserResponse.model_validate(user)
+        user = await UserService.create_user(db, user_data)
+        return USER_RESPONSE_ADAPTER.validate_python(user, from_attributes=True)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.post("/token", response_model=TokenResponse)
 async def login(
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Login and get access token."""
-    user_service = UserService(db)
-    user = user_service.authenticate_user(form_data.username, form_data.password)
+    user = await UserService.authenticate_user(
+        db, form_data.username, form_data.password
+    )
     
     if not user:
         raise HTTPException(
@@ -49,7 +77,7 @@ async def login(
         )
 
     access_token = create_access_token(data={"sub": user.email, "role": user.role})
-    refresh_token = create_refresh_token(user.id, db)
+    refresh_token = create_refresh_token(user.id, background_tasks)
 
     return TokenResponse(
         access_token=access_token,
@@ -58,33 +86,38 @@ async def login(
     )
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: UserResponse = Depends(get_current_user)):
+async def get_current_user_info(current_user: UserResponse = Depends(auth_ctx)):
     """Get current user information."""
     return current_user
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_access_token(
     request: RefreshTokenRequest,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """Refresh access token using refresh token."""
-    refresh_token_repo = RefreshTokenRepository(db)
-    stored_token = refresh_token_repo.get_by_token(request.refresh_token)
-
-    if not stored_token or stored_token.revoked:
+    try:
+        claims = decode_refresh_jwt(request.refresh_token)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token expired"
+        )
+    except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
         )
 
-    if stored_token.expires_at < datetime.now(timezone.utc):
+    # Refresh tokens are single-use
+    if not revoke_refresh_jti(claims["jti"], claims["exp"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Refresh token expired"
+            detail="Invalid refresh token"
         )
 
-    user_service = UserService(db)
-    user = user_service.get_user_by_id(stored_token.user_id)
+    user = await UserService.get_user_by_id(db, int(claims["sub"]))
 
     if not user:
         raise HTTPException(
@@ -93,10 +126,9 @@ async def refresh_access_token(
         )
 
     new_access_token = create_access_token(data={"sub": user.email, "role": user.role})
-    new_refresh_token = create_refresh_token(user.id, db)
-
-    # Revoke old refresh token
-    refresh_token_repo.revoke(request.refresh_token)
+    new_refresh_token = create_refresh_token(
+        user.id, background_tasks, replaces=claims
+    )
 
     return TokenResponse(
         access_token=new_access_token,
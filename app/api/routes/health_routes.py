@@ -1,23 +1,48 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+from cachetools import TTLCache
+import threading
 from app.db.base import get_db
+from app.schemas.health_dto import HealthResponse, RootResponse
 
 router = APIRouter(tags=["Health Check"])
 
-@router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+_PING = text("SELECT 1")
+
+# Health probes arrive constantly; reuse the last database check for a
+# couple of seconds instead of hitting the database on every probe
+_db_status_cache: TTLCache = TTLCache(maxsize=1, ttl=2)
+_db_status_lock = threading.Lock()
+
+async def check_database(db: AsyncSession) -> str:
+    """Return the database status, probing it at most once per TTL."""
+    with _db_status_lock:
+        db_status = _db_status_cache.get("db")
+    if db_status is not None:
+        return db_status
+
+    try:
+        connection = await db.connection()
+        await connection.scalar(_PING)
+        db_status = "healthy"
+    except Exception as e:
+        db_status = f"unhealthy: {str(e)}"
+
+    with _db_status_lock:
+        _db_status_cache["db"] = db_status
+    return db_status
+
+@router.get("/health", response_model=HealthResponse)
+async def health_check(db: AsyncSession = Depends(get_db)):
     """
     Simple health check endpoint to verify:
     - API is responding
     - Database connection is working
     - Current timestamp
     """
-    try:
-        db.execute("SELECT 1")
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
+    db_status = await check_database(db)
 
     return {
         "status": "healthy" if db_status == "healthy" else "degraded",
@@ -26,7 +51,7 @@ async def health_check(db: Session = Depends(get_db)):
         "version": "1.0.0",
     }
 
-@router.get("/")
+@router.get("/", response_model=RootResponse)
 async def root():
     """API root endpoint providing basic information."""
     return {
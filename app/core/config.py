@@ -27,11 +27,19 @@ class Settings(BaseSettings):
     DB_NAME: str = "mydb"
     DB_USER: str = "user"
     DB_PASSWORD: str = "password"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
 
     # JWT
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+    REFRESH_SECRET_KEY: str = "your-refresh-secret-key-here"
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
 
     # Prometheus
     PROMETHEUS_ENABLED: bool = False
@@ -39,7 +47,7 @@ class Settings(BaseSettings):
     @property
     def DATABASE_URL(self) -> str:
         if os.getenv("TESTING") == "True" or os.getenv("APP_ENV") == "testing":
-            return os.getenv("DATABASE_URL", "sqlite:///:memory:")
+            return os.getenv("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
         return f"{self.DB_ENGINE}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
 settings = Settings()
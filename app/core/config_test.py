@@ -13,7 +13,7 @@ class TestSettings(PydanticBaseSettings):
 
     # Override database settings to use SQLite
     DB_ENGINE: str = "sqlite"
-    DATABASE_URL: str = "sqlite:///:memory:"
+    DATABASE_URL: str = "sqlite+aiosqlite:///:memory:"
 
     # Override JWT settings for faster tests
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 5
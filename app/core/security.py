@@ -1,15 +1,23 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import heapq
+import multiprocessing
+import os
 import secrets
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import threading
+import time
+import bcrypt
+from cachetools import TTLCache
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.core.config import settings
-from sqlalchemy.orm import Session
-from app.db.base import get_db
-from app.db.models.user import User
-from app.schemas.user_dto import UserResponse
+from app.db.base import SessionLocal
+from app.db.models.user import USER_RESPONSE_BY_EMAIL_STMT
+from app.schemas.user_dto import USER_RESPONSE_ADAPTER, UserResponse
 
 credentials_exception = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -18,33 +26,157 @@ credentials_exception = HTTPException(
 )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Every bcrypt variant is checked by bcrypt itself
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> UserResponse:
-    try:
-        payload = jwt.decode(
-            token, settings.APP_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
-        email: str = payload.get("sub")
-        if email is None:
+# Allowed signing algorithms and required claims, built once
+_ALG = [settings.JWT_ALGORITHM]
+_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+# Decoded payloads and resolved users, keyed by a digest of the raw token.
+# Entries never outlive the token's own "exp" claim.
+_cache_lock = threading.Lock()
+_payload_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _cache_get(cache: TTLCache, key: bytes):
+    with _cache_lock:
+        entry = cache.get(key)
+    if entry is None or entry[0] <= time.time():
+        return None
+    return entry[1]
+
+def _cache_set(cache: TTLCache, key: bytes, value, exp: float) -> None:
+    expires_at = min(time.time() + cache.ttl, exp)
+    with _cache_lock:
+        cache[key] = (expires_at, value)
+
+def clear_token_cache() -> None:
+    """Drop every cached token verification and revocation result."""
+    with _cache_lock:
+        _payload_cache.clear()
+        _user_cache.clear()
+        _revoked_refresh_jtis.clear()
+        _revoked_refresh_expiry.clear()
+
+async def auth_ctx(token: str = Depends(oauth2_scheme)) -> UserResponse:
+    """Resolve the authenticated user in a single dependency.
+
+    A database session is only opened when the token is not already cached.
+    """
+    key = _token_key(token)
+    cached_user = _cache_get(_user_cache, key)
+    if cached_user is not None:
+        return cached_user
+
+    payload = _cache_get(_payload_cache, key)
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.APP_SECRET_KEY,
+                algorithms=_ALG,
+                options=_DECODE_OPTIONS,
+            )
+        except jwt.PyJWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        _cache_set(_payload_cache, key, payload, payload["exp"])
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
+    async with SessionLocal() as db:
+        result = await db.execute(
+            USER_RESPONSE_BY_EMAIL_STMT, {"email": payload["sub"]}
+        )
+        row = result.first()
+    if row is None:
         raise credentials_exception
-    return UserResponse.model_validate(user)
+    user_response = USER_RESPONSE_ADAPTER.validate_python(row._asdict())
+    _cache_set(_user_cache, key, user_response, payload["exp"])
+    return user_response
+
+# bcrypt runs in worker processes so logins use every core and never block
+# the event loop. The pool is started from the app lifespan; until then
+# (e.g. in tests) hashing falls back to the default thread pool.
+_password_pool: Optional[ProcessPoolExecutor] = None
+
+def start_password_pool() -> None:
+    """Start the worker processes used for password hashing."""
+    global _password_pool
+    if _password_pool is None:
+        # Never fork workers from a process that already runs the event
+        # loop, database drivers and their threads
+        _password_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+
+def shutdown_password_pool() -> None:
+    """Stop the password hashing worker processes."""
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown()
+        _password_pool = None
+
+def hash_password_sync(password: str) -> str:
+    """Hash a password with bcrypt in the calling thread."""
+    salt = bcrypt.gensalt(settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode(), salt).decode()
 
-def hash_password(password: str) -> str:
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash in the calling thread."""
+    if not hashed_password.startswith(_BCRYPT_PREFIXES):
+        return False
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        # Malformed hash, or a password longer than bcrypt's 72-byte limit
+        return False
+
+async def hash_password(password: str) -> str:
     """Hash a password for storing."""
-    return pwd_context.hash(password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool, hash_password_sync, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_pool, verify_password_sync, plain_password, hashed_password
+    )
+
+def _verify_chunk(pairs: List[Tuple[str, str]]) -> List[bool]:
+    # verify_password_sync already maps malformed hashes to False
+    return [verify_password_sync(plain, hashed) for plain, hashed in pairs]
+
+async def verify_many(pairs: Iterable[Tuple[str, str]]) -> List[bool]:
+    """Verify many (plain, hashed) pairs, e.g. for admin audit sweeps.
+
+    The pairs are split into one chunk per CPU so each worker runs a plain
+    loop over bcrypt, instead of paying a dispatch round-trip per pair.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    chunk_size = -(-len(pairs) // (os.cpu_count() or 1))
+    chunks = [pairs[i : i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(_password_pool, _verify_chunk, chunk)
+            for chunk in chunks
+        )
+    )
+    return [ok for chunk_results in results for ok in chunk_results]
+
+async def warm_up() -> None:
+    """Run the bcrypt and JWT code paths once so the first login is not slow."""
+    hashed = await hash_password("warmup")
+    # One verification per CPU so every hashing worker gets exercised
+    await verify_many([("warmup", hashed)] * (os.cpu_count() or 1))
+    token = create_access_token({"sub": "warmup"}, timedelta(seconds=1))
+    jwt.decode(token, settings.APP_SECRET_KEY, algorithms=_ALG, options=_DECODE_OPTIONS)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """Create a JSON Web Token (JWT) access token."""
@@ -57,15 +189,74 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
         to_encode, settings.APP_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
     )
 
+# jti -> exp of refresh tokens that have already been rotated. There is no
+# size cap: an entry is only dropped once the token itself has expired, so
+# a revoked jti can never be replayed. The heap orders entries by exp for
+# cheap pruning. The set is per process and is reloaded from the
+# refresh_tokens audit table at startup; share it (e.g. through Redis)
+# when running several workers.
+_revoked_refresh_jtis: Dict[str, float] = {}
+_revoked_refresh_expiry: List[Tuple[float, str]] = []
+
+def _add_revoked_refresh_jti(jti: str, exp: float) -> None:
+    # Caller holds _cache_lock
+    now = time.time()
+    while _revoked_refresh_expiry and _revoked_refresh_expiry[0][0] <= now:
+        _, expired = heapq.heappop(_revoked_refresh_expiry)
+        _revoked_refresh_jtis.pop(expired, None)
+    if exp > now:
+        _revoked_refresh_jtis[jti] = exp
+        heapq.heappush(_revoked_refresh_expiry, (exp, jti))
+
+def create_refresh_jwt(user_id: int) -> tuple[str, dict]:
+    """Create a signed refresh token and return it along with its claims."""
+    claims = {
+        "sub": str(user_id),
+        "type": "refresh",
+        "jti": secrets.token_urlsafe(16),
+        "exp": datetime.now(timezone.utc)
+        + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    }
+    token = jwt.encode(
+        claims.copy(), settings.REFRESH_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+    )
+    return token, claims
+
+def decode_refresh_jwt(token: str) -> dict:
+    """Decode a refresh token, raising PyJWTError if it is invalid or expired."""
+    payload = jwt.decode(
+        token,
+        settings.REFRESH_SECRET_KEY,
+        algorithms=_ALG,
+        options={"require": ["exp", "sub", "jti"]},
+    )
+    if payload.get("type") != "refresh":
+        raise jwt.InvalidTokenError("Not a refresh token")
+    return payload
+
+def revoke_refresh_jti(jti: str, exp: float) -> bool:
+    """Mark a refresh token as used until its exp. Returns False if it already was."""
+    with _cache_lock:
+        if jti in _revoked_refresh_jtis:
+            return False
+        _add_revoked_refresh_jti(jti, exp)
+        return True
+
+def restore_revoked_refresh_jtis(tokens: Iterable[Tuple[str, datetime]]) -> None:
+    """Re-populate the revocation set from (jti, expires_at) pairs at startup."""
+    with _cache_lock:
+        for jti, expires_at in tokens:
+            if expires_at.tzinfo is None:
+                # SQLite hands back naive UTC datetimes
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            _add_revoked_refresh_jti(jti, expires_at.timestamp())
+
 def verify_token(token: str):
     """Verify a JWT token and return the username if valid."""
     try:
         payload = jwt.decode(
-            token, settings.APP_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+            token, settings.APP_SECRET_KEY, algorithms=_ALG, options=_DECODE_OPTIONS
         )
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        return username
-    except JWTError:
+        return payload["sub"]
+    except jwt.PyJWTError:
         raise credentials_exception
@@ -1,5 +1,6 @@
-from sqlalchemy import URL, create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from app.db.models.base import Base
 import app.db.models
 from app.core.config import settings
@@ -7,42 +8,74 @@ import os
 
 is_test = os.environ.get("APP_ENV") == "test"
 
+# Compiled SQL is cached per engine; size it for every statement we run
+QUERY_CACHE_SIZE = 1200
+
+# Keep warm connections around instead of reconnecting on every burst
+pool_options = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": True,
+}
+
+def is_sqlite_memory(database_url) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
 if is_test:
     from app.core.config_test import test_settings
     SQLALCHEMY_DATABASE_URL = test_settings.DATABASE_URL
-    engine = create_engine(
+    engine = create_async_engine(
         SQLALCHEMY_DATABASE_URL,
         connect_args={"check_same_thread": False},
+        query_cache_size=QUERY_CACHE_SIZE,
+        poolclass=StaticPool,
     )
 else:
     if settings.DB_ENGINE == "postgresql":
         url = URL.create(
-            drivername="postgresql",
+            drivername="postgresql+asyncpg",
             username=settings.DB_USER,
             password=settings.DB_PASSWORD,
             host=settings.DB_HOST,
             database=settings.DB_NAME,
         )
-        engine = create_engine(url, connect_args={"sslmode": "require"})
+        engine = create_async_engine(
+            url,
+            connect_args={"ssl": "require"},
+            query_cache_size=QUERY_CACHE_SIZE,
+            **pool_options,
+        )
     else:
+        # DB_ENGINE must name an async driver here, e.g. "sqlite+aiosqlite"
         DATABASE_URL = f"{settings.DB_ENGINE}://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-        engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+        if is_sqlite_memory(DATABASE_URL):
+            engine = create_async_engine(
+                DATABASE_URL,
+                connect_args={"check_same_thread": False},
+                query_cache_size=QUERY_CACHE_SIZE,
+                poolclass=StaticPool,
+            )
+        else:
+            engine = create_async_engine(
+                DATABASE_URL,
+                connect_args={"check_same_thread": False},
+                query_cache_size=QUERY_CACHE_SIZE,
+                poolclass=AsyncAdaptedQueuePool,
+                **pool_options,
+            )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
 
-def init_db():
-    if settings.APP_DEBUG:
-        Base.metadata.drop_all(bind=engine)
-        print("DEBUG: flushing db")
-    Base.metadata.create_all(bind=engine)
+async def init_db():
+    """Create any missing tables. Called once per process from the app lifespan."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
-# Only initialize DB if not in test mode
-if not is_test:
-    init_db()
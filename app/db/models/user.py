@@ -1,5 +1,5 @@
-from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, bindparam, select
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.models.base import Base
 
@@ -13,11 +13,14 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String(128), nullable=False)
     role = Column(String(50), default="user")
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at = Column(
-        DateTime,
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
     )
 
     # Add the relationship to RefreshToken
@@ -27,3 +30,9 @@ class User(Base):
 
     def __repr__(self):
         return f"<User(id={self.id}, name='{self.name}', email='{self.email}')>"
+
+# Prebuilt lookups for the login and authentication hot paths
+USER_BY_EMAIL_STMT = select(User).where(User.email == bindparam("email"))
+USER_RESPONSE_BY_EMAIL_STMT = select(
+    User.id, User.email, User.name, User.role, User.created_at, User.updated_at
+).where(User.email == bindparam("email"))
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -5,6 +6,27 @@ import uvicorn
 import app.api.routes.health_routes as health_endpoints
 import app.api.routes.auth_routes as auth_endpoints
 from app.core.config import settings
+from app.core.security import (
+    restore_revoked_refresh_jtis,
+    shutdown_password_pool,
+    start_password_pool,
+    warm_up,
+)
+from app.db.base import SessionLocal, init_db
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    # Rotated refresh tokens must stay unusable across restarts
+    async with SessionLocal() as db:
+        restore_revoked_refresh_jtis(await RefreshTokenRepository.list_revoked(db))
+    start_password_pool()
+    try:
+        await warm_up()
+        yield
+    finally:
+        shutdown_password_pool()
 
 app = FastAPI(
     title="FastAPI Boilerplate",
@@ -18,6 +40,7 @@ app = FastAPI(
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT",
     },
+    lifespan=lifespan,
 )
 
 app.include_router(health_endpoints.router)
@@ -1,28 +1,90 @@
-from datetime import datetime, timezone
-from typing import Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
 from app.db.models.refresh_token import RefreshToken
 
 class RefreshTokenRepository:
-    def __init__(self, db: Session):
-        self.db = db
+    """Stateless data access for refresh tokens; every method takes the session."""
 
-    def create(self, user_id: int, token: str, expires_at: datetime) -> RefreshToken:
+    @staticmethod
+    async def create(
+        db: AsyncSession, user_id: int, token: str, expires_at: datetime
+    ) -> Optional[RefreshToken]:
+        """Insert a token, or return None if it is already recorded."""
         refresh_token = RefreshToken(
             token=token, user_id=user_id, expires_at=expires_at
         )
-        self.db.add(refresh_token)
-        self.db.commit()
-        self.db.refresh(refresh_token)
+        db.add(refresh_token)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # mark_revoked got there first; its row must win
+            await db.rollback()
+            return None
+        await db.refresh(refresh_token)
         return refresh_token
 
-    def get_by_token(self, token: str) -> Optional[RefreshToken]:
-        return self.db.query(RefreshToken).filter(RefreshToken.token == token).first()
+    @staticmethod
+    async def revoke(db: AsyncSession, token: str) -> Optional[int]:
+        """Revoke a live, unexpired token and return its user_id.
 
-    def revoke(self, token: str) -> bool:
-        refresh_token = self.get_by_token(token)
-        if not refresh_token:
-            return False
-        refresh_token.revoked = True
-        self.db.commit()
-        return True
+        Revoked or expired tokens are filtered in SQL and never loaded.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token == token,
+                RefreshToken.revoked.is_(False),
+                RefreshToken.expires_at > func.now(),
+            )
+            .values(revoked=True)
+            .returning(RefreshToken.user_id)
+        )
+        result = await db.execute(stmt)
+        user_id = result.scalar_one_or_none()
+        await db.commit()
+        return user_id
+
+    @staticmethod
+    async def mark_revoked(
+        db: AsyncSession, user_id: int, token: str, expires_at: datetime
+    ) -> None:
+        """Record a token as revoked, whether or not its row exists yet.
+
+        Rows are written after the response is sent, so a token can be
+        rotated before its own insert has landed.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.token == token)
+            .values(revoked=True)
+        )
+        result = await db.execute(stmt)
+        if result.rowcount == 0:
+            db.add(
+                RefreshToken(
+                    token=token, user_id=user_id, expires_at=expires_at, revoked=True
+                )
+            )
+            try:
+                await db.commit()
+                return
+            except IntegrityError:
+                # The token's own insert landed in between
+                await db.rollback()
+                await db.execute(stmt)
+        await db.commit()
+
+    @staticmethod
+    async def list_revoked(db: AsyncSession) -> List[Tuple[str, datetime]]:
+        """Return (token, expires_at) for revoked tokens that have not expired yet."""
+        result = await db.execute(
+            select(RefreshToken.token, RefreshToken.expires_at).where(
+                RefreshToken.revoked.is_(True),
+                RefreshToken.expires_at > func.now(),
+            )
+        )
+        return [tuple(row) for row in result.all()]
@@ -1,17 +1,17 @@
-from datetime import datetime, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import hash_password
-from app.db.models.user import User
+from app.db.models.user import USER_BY_EMAIL_STMT, User
 from app.schemas.user_dto import UserCreateDTO, UserUpdateDTO
 from app.core.config import settings
 
 class UserRepository:
-    def __init__(self, db: Session):
-        self.db = db
+    """Stateless data access for users; every method takes the session."""
 
-    def create(self, user_data: UserCreateDTO) -> User:
-        hashed_pw = hash_password(user_data.password)
+    @staticmethod
+    async def create(db: AsyncSession, user_data: UserCreateDTO) -> User:
+        hashed_pw = await hash_password(user_data.password)
         user = User(
             name=user_data.name, 
             email=user_data.email, 
@@ -21,39 +21,47 @@ class UserRepository:
         if settings.APP_DEBUG and ("admin" in user_data.email):
             user.role = "admin"
 
-        self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
         return user
 
-    def get_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+    @staticmethod
+    async def get_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        return await db.get(User, user_id)
 
-    def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+    @staticmethod
+    async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        result = await db.execute(USER_BY_EMAIL_STMT, {"email": email})
+        return result.scalar_one_or_none()
 
-    def list(self) -> List[User]:
-        return self.db.query(User).all()
+    @staticmethod
+    async def list(db: AsyncSession) -> List[User]:
+        result = await db.execute(select(User))
+        return list(result.scalars().all())
 
-    def update(self, user_id: int, user_data: UserUpdateDTO) -> Optional[User]:
-        user = self.get_by_id(user_id)
+    @staticmethod
+    async def update(
+        db: AsyncSession, user_id: int, user_data: UserUpdateDTO
+    ) -> Optional[User]:
+        user = await UserRepository.get_by_id(db, user_id)
         if not user:
             return None
         update_data = user_data.model_dump(exclude_unset=True)
         if "password" in update_data and update_data["password"]:
-            update_data["hashed_password"] = hash_password(update_data.pop("password"))
+            update_data["hashed_password"] = await hash_password(update_data.pop("password"))
         for key, value in update_data.items():
             setattr(user, key, value)
 
-        user.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
 
-    def delete(self, user_id: int) -> bool:
-        user = self.get_by_id(user_id)
+    @staticmethod
+    async def delete(db: AsyncSession, user_id: int) -> bool:
+        user = await UserRepository.get_by_id(db, user_id)
         if not user:
             return False
-        self.db.delete(user)
-        self.db.commit()
+        await db.delete(user)
+        await db.commit()
         return True
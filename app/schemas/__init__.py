@@ -1,10 +1,14 @@
-from .user_dto import UserCreateDTO, UserUpdateDTO, UserResponse
+from .user_dto import UserCreateDTO, UserUpdateDTO, UserResponse, USER_RESPONSE_ADAPTER
 from .auth_dto import TokenResponse, RefreshTokenRequest
+from .health_dto import HealthResponse, RootResponse
 
 __all__ = [
     "UserCreateDTO",
     "UserUpdateDTO",
     "UserResponse",
+    "USER_RESPONSE_ADAPTER",
     "TokenResponse",
     "RefreshTokenRequest",
+    "HealthResponse",
+    "RootResponse",
 ]
@@ -5,5 +5,7 @@ class TokenResponse(BaseModel):
     refresh_token: str
     token_type: str = "bearer"
 
+    model_config = {"frozen": True}
+
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+class HealthResponse(BaseModel):
+    status: str
+    timestamp: str
+    database: str
+    version: str
+
+class RootResponse(BaseModel):
+    message: str
+    version: str
+    docs: str
@@ -1,17 +1,29 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, TypeAdapter, field_validator
 from typing import Optional
 from datetime import datetime
 
+# bcrypt only looks at the first 72 bytes of a password and rejects longer ones
+MAX_PASSWORD_BYTES = 72
+
+def _check_password_length(password: Optional[str]) -> Optional[str]:
+    if password is not None and len(password.encode()) > MAX_PASSWORD_BYTES:
+        raise ValueError(f"Password must be at most {MAX_PASSWORD_BYTES} bytes")
+    return password
+
 class UserCreateDTO(BaseModel):
     name: str
     email: EmailStr
     password: str
 
+    _password_length = field_validator("password")(_check_password_length)
+
 class UserUpdateDTO(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
     password: Optional[str] = None
 
+    _password_length = field_validator("password")(_check_password_length)
+
 class UserResponse(BaseModel):
     id: int
     name: str
@@ -20,4 +32,8 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = {"from_attributes": True}
+    # Frozen: cached instances are shared between requests
+    model_config = {"from_attributes": True, "frozen": True, "extra": "ignore"}
+
+# Built once and reused on the login, /auth/me and refresh paths
+USER_RESPONSE_ADAPTER = TypeAdapter(UserResponse)
@@ -1,41 +1,63 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.core.security import verify_password
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import hash_password_sync, verify_many, verify_password
 from app.db.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_dto import UserCreateDTO, UserResponse, UserUpdateDTO
 
 USER_NOT_FOUND = "User not found"
 
+# Verified against when the email is unknown, so a failed login costs the
+# same whether or not the account exists
+_DUMMY_HASH = hash_password_sync("x" * 16)
+
 class UserService:
-    def __init__(self, db_session: Session):
-        self.repository = UserRepository(db_session)
+    """Stateless user operations; every method takes the session."""
 
-    def create_user(self, user_data: UserCreateDTO) -> User:
-        existing_user = self.repository.get_by_email(user_data.email)
+    @staticmethod
+    async def create_user(db: AsyncSession, user_data: UserCreateDTO) -> User:
+        existing_user = await UserRepository.get_by_email(db, user_data.email)
         if existing_user:
             raise ValueError("A user with this email already exists.")
-        return self.repository.create(user_data)
+        return await UserRepository.create(db, user_data)
 
-    def get_user_by_email(self, email: str) -> User:
-        return self.repository.get_by_email(email)
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> User:
+        return await UserRepository.get_by_email(db, email)
 
-    def authenticate_user(self, email: str, password: str) -> User:
-        user = self.get_user_by_email(email)
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, email: str, password: str) -> User:
+        user = await UserRepository.get_by_email(db, email)
         if not user:
+            await verify_password(password, _DUMMY_HASH)
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password(password, user.hashed_password):
             return None
         return user
 
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
-        return self.repository.get_by_id(user_id)
-
-    def list_users(self) -> List[User]:
-        return self.repository.list()
-
-    def update_user(self, user_id: int, user_data: UserUpdateDTO) -> Optional[User]:
-        return self.repository.update(user_id, user_data)
-
-    def delete_user(self, user_id: int) -> bool:
-        return self.repository.delete(user_id)
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        return await UserRepository.get_by_id(db, user_id)
+
+    @staticmethod
+    async def list_users(db: AsyncSession) -> List[User]:
+        return await UserRepository.list(db)
+
+    @staticmethod
+    async def find_users_with_password(db: AsyncSession, password: str) -> List[User]:
+        """Return every user whose password is `password` (e.g. a leaked one)."""
+        users = await UserRepository.list(db)
+        matches = await verify_many(
+            (password, user.hashed_password) for user in users
+        )
+        return [user for user, matched in zip(users, matches) if matched]
+
+    @staticmethod
+    async def update_user(
+        db: AsyncSession, user_id: int, user_data: UserUpdateDTO
+    ) -> Optional[User]:
+        return await UserRepository.update(db, user_id, user_data)
+
+    @staticmethod
+    async def delete_user(db: AsyncSession, user_id: int) -> bool:
+        return await UserRepository.delete(db, user_id)
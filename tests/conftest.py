@@ -1,7 +1,6 @@
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import os
 
 # Set test environment BEFORE any imports
@@ -10,40 +9,30 @@ os.environ["APP_ENV"] = "test"
 from app.db.models.base import Base
 import app.db.models  # Import all models to ensure they're registered
 
-# Use a named in-memory database that can be shared
-SQLALCHEMY_DATABASE_URL = "sqlite:///file:testdb?mode=memory&cache=shared&uri=true"
+# In test mode the app engine is a single shared in-memory SQLite
+# connection, so requests and background tasks all see the same database.
+from app.db.base import SessionLocal, engine, init_db
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False, "uri": True}
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async def _drop_schema():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
 
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    asyncio.run(init_db())
     try:
-        yield db
+        yield SessionLocal
     finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
+        asyncio.run(_drop_schema())
 
 @pytest.fixture(scope="function")
 def client(db_session):
-    """Create a test client with database dependency override."""
+    """Create a test client against the fresh database."""
     # Import app after setting test environment
     from app.main import app
-    from app.db.base import get_db
-    
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-    
-    app.dependency_overrides[get_db] = override_get_db
+    from app.core.security import clear_token_cache
+
     client = TestClient(app)
     yield client
-    app.dependency_overrides.clear()
+    clear_token_cache()
@@ -1,3 +1,37 @@
+import asyncio
+import jwt
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.api.routes import auth_routes
+from app.db.models.refresh_token import RefreshToken
+
+def _register_and_login(client):
+    client.post(
+        "/auth/register",
+        json={
+            "name": "Test User",
+            "email": "test@example.com",
+            "password": "testpassword123"
+        }
+    )
+    return client.post(
+        "/auth/token",
+        data={
+            "username": "test@example.com",
+            "password": "testpassword123"
+        }
+    ).json()
+
+def _jti(refresh_token):
+    return jwt.decode(refresh_token, options={"verify_signature": False})["jti"]
+
+def _audit_rows(session_factory):
+    async def fetch():
+        async with session_factory() as db:
+            result = await db.execute(select(RefreshToken.token, RefreshToken.revoked))
+            return dict(result.all())
+    return asyncio.run(fetch())
+
 def test_register_user(client):
     """Test user registration."""
     response = client.post(
@@ -69,3 +103,182 @@ def test_get_current_user(client):
     assert response.status_code == 200
     data = response.json()
     assert data["email"] == "test@example.com"
+
+def _count_auth_work(monkeypatch):
+    """Count the token decodes and database sessions auth_ctx performs."""
+    from app.core import security
+
+    calls = {"decode": 0, "session": 0}
+    decode, session_factory = jwt.decode, security.SessionLocal
+
+    def counting_decode(*args, **kwargs):
+        calls["decode"] += 1
+        return decode(*args, **kwargs)
+
+    def counting_session():
+        calls["session"] += 1
+        return session_factory()
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    monkeypatch.setattr(security, "SessionLocal", counting_session)
+    return calls
+
+def test_get_current_user_repeated(client, monkeypatch):
+    """Test repeated requests with the same token (served from the cache)."""
+    token = _register_and_login(client)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    calls = _count_auth_work(monkeypatch)
+
+    first = client.get("/auth/me", headers=headers)
+    assert calls == {"decode": 1, "session": 1}
+    second = client.get("/auth/me", headers=headers)
+    assert calls == {"decode": 1, "session": 1}
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.json() == second.json()
+
+def test_get_current_user_cache_expires_with_token(client, monkeypatch):
+    """Test that cached entries never outlive the token's exp."""
+    from datetime import timedelta
+    from types import SimpleNamespace
+    from app.core import security
+
+    _register_and_login(client)
+    token = security.create_access_token(
+        {"sub": "test@example.com", "role": "user"}, timedelta(seconds=5)
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    calls = _count_auth_work(monkeypatch)
+
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert calls == {"decode": 1, "session": 1}
+
+    # Past the token's exp but well within the caches' own TTLs
+    now = security.time.time()
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: now + 10))
+    client.get("/auth/me", headers=headers)
+    assert calls == {"decode": 2, "session": 2}
+
+def test_get_current_user_invalid_token(client):
+    """Test that an invalid token is rejected."""
+    response = client.get(
+        "/auth/me",
+        headers={"Authorization": "Bearer not-a-valid-token"}
+    )
+    assert response.status_code == 401
+
+def test_refresh_token(client):
+    """Test refreshing tokens and that a refresh token is single-use."""
+    refresh_token = _register_and_login(client)["refresh_token"]
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    data = response.json()
+    assert "access_token" in data
+    assert data["refresh_token"] != refresh_token
+
+    # The old refresh token has been revoked
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+def test_refresh_with_access_token_rejected(client):
+    """Test that an access token cannot be used as a refresh token."""
+    access_token = _register_and_login(client)["access_token"]
+
+    response = client.post("/auth/refresh", json={"refresh_token": access_token})
+    assert response.status_code == 401
+
+def test_login_unknown_user(client):
+    """Test login with an email that is not registered."""
+    response = client.post(
+        "/auth/token",
+        data={
+            "username": "nobody@example.com",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 401
+
+def test_register_password_too_long(client):
+    """Test that registration rejects passwords over bcrypt's 72 bytes."""
+    response = client.post(
+        "/auth/register",
+        json={
+            "name": "Test User",
+            "email": "test@example.com",
+            "password": "x" * 100
+        }
+    )
+    assert response.status_code == 422
+
+def test_login_password_too_long(client):
+    """Test login with a password over bcrypt's 72 bytes."""
+    _register_and_login(client)
+    response = client.post(
+        "/auth/token",
+        data={
+            "username": "test@example.com",
+            "password": "x" * 100
+        }
+    )
+    assert response.status_code == 401
+
+def test_login_unknown_user_password_too_long(client):
+    """Test login with an unknown email and a password over 72 bytes."""
+    response = client.post(
+        "/auth/token",
+        data={
+            "username": "nobody@example.com",
+            "password": "x" * 100
+        }
+    )
+    assert response.status_code == 401
+
+def test_refresh_token_audit_log(client, db_session):
+    """Test that login and refresh record and revoke audit rows."""
+    old_token = _register_and_login(client)["refresh_token"]
+    assert _audit_rows(db_session) == {_jti(old_token): False}
+
+    new_token = client.post(
+        "/auth/refresh", json={"refresh_token": old_token}
+    ).json()["refresh_token"]
+    assert _audit_rows(db_session) == {_jti(old_token): True, _jti(new_token): False}
+
+def test_revoked_refresh_token_survives_restart(client):
+    """Test that rotated refresh tokens stay revoked after a restart."""
+    from app.main import app
+    from app.core.security import clear_token_cache
+
+    old_token = _register_and_login(client)["refresh_token"]
+    response = client.post("/auth/refresh", json={"refresh_token": old_token})
+    assert response.status_code == 200
+
+    # Simulate a new process: the in-memory revocation set is empty
+    clear_token_cache()
+    with TestClient(app) as restarted:
+        response = restarted.post("/auth/refresh", json={"refresh_token": old_token})
+    assert response.status_code == 401
+
+def test_refresh_before_login_audit_row(client, db_session, monkeypatch):
+    """Test that a rotation is recorded even if it beats the login's audit row."""
+    from app.main import app
+    from app.core.security import clear_token_cache
+
+    # Hold back the login's audit write until after the refresh
+    deferred = []
+    async def defer(*args):
+        deferred.append(args)
+    monkeypatch.setattr(auth_routes, "record_refresh_token", defer)
+    old_token = _register_and_login(client)["refresh_token"]
+    monkeypatch.undo()
+
+    new_token = client.post(
+        "/auth/refresh", json={"refresh_token": old_token}
+    ).json()["refresh_token"]
+    asyncio.run(auth_routes.record_refresh_token(*deferred[0]))
+    assert _audit_rows(db_session) == {_jti(old_token): True, _jti(new_token): False}
+
+    clear_token_cache()
+    with TestClient(app) as restarted:
+        response = restarted.post("/auth/refresh", json={"refresh_token": old_token})
+    assert response.status_code == 401
@@ -6,6 +6,7 @@ def test_health_check(client):
     assert data["status"] in ["healthy", "degraded"]
     assert "timestamp" in data
     assert "database" in data
+    assert data["database"] == "healthy"
 
 def test_root(client):
     """Test root endpoint."""
@@ -14,3 +15,20 @@ def test_root(client):
     data = response.json()
     assert "message" in data
     assert "version" in data
+
+def test_startup_lifespan(db_session):
+    """Test that the app starts up (database, hashing pool, warm-up) and serves."""
+    from fastapi.testclient import TestClient
+    from app.core import security
+    from app.main import app
+
+    with TestClient(app) as client:
+        response = client.get("/health")
+        # Hashing goes through the worker processes while the app runs
+        assert security._password_pool is not None
+        hashed = security.hash_password_sync("testpassword123")
+        assert client.portal.call(
+            security.verify_password, "testpassword123", hashed
+        ) is True
+    assert response.status_code == 200
+    assert security._password_pool is None
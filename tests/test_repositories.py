@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from app.db.models.refresh_token import RefreshToken
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.user_dto import UserCreateDTO
+
+def _create_tokens(session_factory, tokens):
+    """Create a user and one refresh token per (token, expires_in) pair."""
+    async def run():
+        async with session_factory() as db:
+            user = await UserRepository.create(
+                db,
+                UserCreateDTO(
+                    name="Test User",
+                    email="test@example.com",
+                    password="testpassword123"
+                )
+            )
+            now = datetime.now(timezone.utc)
+            for token, expires_in in tokens:
+                await RefreshTokenRepository.create(
+                    db, user.id, token, now + expires_in
+                )
+            return user.id
+    return asyncio.run(run())
+
+def _revoke(session_factory, token):
+    async def run():
+        async with session_factory() as db:
+            return await RefreshTokenRepository.revoke(db, token)
+    return asyncio.run(run())
+
+def _revoked(session_factory, token):
+    async def run():
+        async with session_factory() as db:
+            result = await db.execute(
+                select(RefreshToken.revoked).where(RefreshToken.token == token)
+            )
+            return result.scalar_one()
+    return asyncio.run(run())
+
+def test_revoke_live_token(db_session):
+    """Test that revoking a live token returns its user and marks it revoked."""
+    user_id = _create_tokens(db_session, [("live", timedelta(days=1))])
+
+    assert _revoke(db_session, "live") == user_id
+    assert _revoked(db_session, "live") is True
+
+def test_revoke_already_revoked_token(db_session):
+    """Test that a token can only be revoked once."""
+    _create_tokens(db_session, [("live", timedelta(days=1))])
+    _revoke(db_session, "live")
+
+    assert _revoke(db_session, "live") is None
+    assert _revoked(db_session, "live") is True
+
+def test_revoke_expired_token(db_session):
+    """Test that an expired token is left untouched."""
+    _create_tokens(db_session, [("expired", timedelta(days=-1))])
+
+    assert _revoke(db_session, "expired") is None
+    assert _revoked(db_session, "expired") is False
+
+def test_revoke_unknown_token(db_session):
+    """Test revoking a token that was never issued."""
+    assert _revoke(db_session, "missing") is None
+
+def test_mark_revoked_before_create(db_session):
+    """Test that a revocation recorded before the token's insert wins."""
+    user_id = _create_tokens(db_session, [])
+    expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+
+    async def run():
+        async with db_session() as db:
+            await RefreshTokenRepository.mark_revoked(db, user_id, "late", expires_at)
+            return await RefreshTokenRepository.create(db, user_id, "late", expires_at)
+
+    assert asyncio.run(run()) is None
+    assert _revoked(db_session, "late") is True
+
+def test_mark_revoked_existing_token(db_session):
+    """Test that mark_revoked revokes a token that is already recorded."""
+    user_id = _create_tokens(db_session, [("live", timedelta(days=1))])
+
+    async def run():
+        async with db_session() as db:
+            await RefreshTokenRepository.mark_revoked(
+                db, user_id, "live", datetime.now(timezone.utc)
+            )
+
+    asyncio.run(run())
+    assert _revoked(db_session, "live") is True
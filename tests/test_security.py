@@ -0,0 +1,78 @@
+import asyncio
+import time
+from app.core.security import (
+    clear_token_cache,
+    hash_password_sync,
+    revoke_refresh_jti,
+    verify_many,
+    verify_password_sync,
+)
+from app.services.user_service import UserService
+
+def test_verify_password_bcrypt_variants():
+    """Test that $2a$ and $2y$ hashes verify like $2b$ ones."""
+    hashed = hash_password_sync("testpassword123")
+    assert hashed.startswith("$2b$")
+    for prefix in ("$2a$", "$2y$"):
+        legacy = prefix + hashed[4:]
+        assert verify_password_sync("testpassword123", legacy) is True
+        assert verify_password_sync("wrongpassword", legacy) is False
+
+def test_verify_password_rejects_bad_input():
+    """Test that unusable hashes and overlong passwords do not raise."""
+    hashed = hash_password_sync("testpassword123")
+    assert verify_password_sync("x" * 100, hashed) is False
+    assert verify_password_sync("testpassword123", "$2b$not-a-hash") is False
+    assert verify_password_sync("testpassword123", "plaintext") is False
+
+def test_verify_many_keeps_input_order():
+    """Test that verify_many returns one result per pair, in input order."""
+    hashed = hash_password_sync("testpassword123")
+    pairs = [
+        ("testpassword123", hashed),
+        ("wrongpassword", hashed),
+        ("testpassword123", "$2b$not-a-hash"),
+        ("testpassword123", "plaintext"),
+        ("testpassword123", hashed),
+    ] * 3
+    results = asyncio.run(verify_many(pairs))
+    assert results == [True, False, False, False, True] * 3
+
+def test_find_users_with_password(client, db_session):
+    """Test finding the users that share a given password."""
+    for email, password in [
+        ("alice@example.com", "leakedpassword"),
+        ("bob@example.com", "testpassword123"),
+        ("carol@example.com", "leakedpassword"),
+    ]:
+        client.post(
+            "/auth/register",
+            json={"name": "Test User", "email": email, "password": password}
+        )
+
+    async def run():
+        async with db_session() as db:
+            users = await UserService.find_users_with_password(db, "leakedpassword")
+            return [user.email for user in users]
+
+    assert asyncio.run(run()) == ["alice@example.com", "carol@example.com"]
+
+def test_revoked_refresh_jti_is_never_evicted():
+    """Test that a revoked jti stays revoked however many follow it."""
+    exp = time.time() + 3600
+    try:
+        assert revoke_refresh_jti("victim", exp) is True
+        for i in range(100_001):
+            revoke_refresh_jti(f"jti-{i}", exp)
+        assert revoke_refresh_jti("victim", exp) is False
+    finally:
+        clear_token_cache()
+
+def test_revoked_refresh_jti_expires_with_token():
+    """Test that revocations are only dropped once the token has expired."""
+    try:
+        assert revoke_refresh_jti("expired", time.time() - 1) is True
+        assert revoke_refresh_jti("expired", time.time() + 3600) is True
+        assert revoke_refresh_jti("expired", time.time() + 3600) is False
+    finally:
+        clear_token_cache()